@@ -1,2 +1,3 @@
 from .fastquant import *
 from .strategies import *
+from .sweeps import *
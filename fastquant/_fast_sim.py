@@ -0,0 +1,173 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+
+from ._njit import njit, prange
+
+
+# Explicit signatures so the kernels are compiled once at import (or loaded from the on-disk cache),
+# instead of on the first backtest. Prices can be float64 or float32 (cash is always carried as float64)
+@njit(
+    [
+        "Tuple((f8[:], f8[:, :]))(f8[:], f8[:], b1[:], b1[:], f8, f8, f8, f8, b1)",
+        "Tuple((f8[:], f8[:, :]))(f4[:], f4[:], b1[:], b1[:], f8, f8, f8, f8, b1)",
+    ],
+    cache=True,
+)
+def _simulate(
+    close,
+    open_,
+    buy_signals,
+    sell_signals,
+    init_cash,
+    buy_prop,
+    sell_prop,
+    comm,
+    exec_close,
+):
+    """
+    Array based equivalent of `BaseStrategy.next()` used by the numba engine
+
+    Only the bars with a buy or sell signal are visited; the equity curve is rebuilt from the filled orders afterwards.
+    Orders created on bar `i` are filled on bar `i + 1`, mirroring the cerebro setup in `backtest()`:
+    buys at the closing price of the bar they were created on (cheat-on-close),
+    sells at the closing price of the next bar. With `exec_close=False`, both are filled at the next opening price.
+
+    Parameters
+    ----------
+    close : np.ndarray
+        Closing prices (float64 or float32)
+    open_ : np.ndarray
+        Opening prices (same type as `close`), only used when `exec_close` is False
+    buy_signals : np.ndarray
+        Boolean array, True on the bars where the strategy signals a buy
+    sell_signals : np.ndarray
+        Boolean array, True on the bars where the strategy signals a sell
+    init_cash : float
+        Starting cash
+    buy_prop : float
+        Proportion of the afforded size to buy
+    sell_prop : float
+        Proportion of the current position to sell
+    comm : float
+        Commission per transaction, as a fraction of the transaction value
+    exec_close : bool
+        True to execute on closing prices, False to execute on the next opening prices
+
+    Returns
+    -------
+    equity : np.ndarray
+        Portfolio value at the close of every bar
+    trades : np.ndarray
+        One row per executed order: bar index, signed size (negative for sells), price, commission
+    """
+    n = close.shape[0]
+    trades = np.empty((2 * n, 4))
+    n_trades = 0
+    # Cash and share changes per bar, used to rebuild the equity curve once all the orders are known
+    cash_delta = np.zeros(n)
+    shares_delta = np.zeros(n)
+    cash_delta[0] = init_cash
+
+    cash = init_cash
+    shares = 0
+    # Add allowance to commission per transaction (avoid margin)
+    # Hoisted reciprocal, so the afforded size needs a single division per bar
+    inv_price_mult = 1.0 / (1.0 + comm + 0.001)
+
+    # Cash and shares only change when an order is filled, so only the bars with a signal need to be visited
+    # (the last bar is skipped since purchases are based on next day prices)
+    events = np.flatnonzero(buy_signals[: n - 1] | sell_signals[: n - 1])
+    for i in events:
+        buy_size = 0
+        sell_size = 0
+        # Only buy if there is enough cash for at least one stock
+        if cash >= close[i] and buy_signals[i]:
+            afforded_size = int(cash * inv_price_mult / close[i])
+            buy_prop_size = int(afforded_size * buy_prop)
+            if exec_close:
+                buy_price = close[i]
+            else:
+                buy_price = open_[i + 1]
+                afforded_size = int(cash * inv_price_mult / buy_price)
+            buy_size = min(buy_prop_size, afforded_size)
+
+        # Only sell if you hold least one unit of the stock (no short selling)
+        if shares > 0 and sell_signals[i]:
+            sell_size = int(shares * sell_prop)
+
+        # Fill the orders on the next bar (buys are processed first, as in the broker)
+        if buy_size > 0:
+            cost = buy_size * buy_price
+            # Reject the order if the cash can't cover the cost (margin)
+            if cost * (1.0 + comm) <= cash:
+                cash -= cost * (1.0 + comm)
+                shares += buy_size
+                cash_delta[i + 1] -= cost * (1.0 + comm)
+                shares_delta[i + 1] += buy_size
+                trades[n_trades, 0] = i + 1
+                trades[n_trades, 1] = buy_size
+                trades[n_trades, 2] = buy_price
+                trades[n_trades, 3] = cost * comm
+                n_trades += 1
+        if sell_size > 0:
+            sell_price = close[i + 1] if exec_close else open_[i + 1]
+            cash += sell_size * sell_price * (1.0 - comm)
+            shares -= sell_size
+            cash_delta[i + 1] += sell_size * sell_price * (1.0 - comm)
+            shares_delta[i + 1] -= sell_size
+            trades[n_trades, 0] = i + 1
+            trades[n_trades, 1] = -sell_size
+            trades[n_trades, 2] = sell_price
+            trades[n_trades, 3] = sell_size * sell_price * comm
+            n_trades += 1
+
+    equity = np.cumsum(cash_delta) + np.cumsum(shares_delta) * close
+    return equity, trades[:n_trades]
+
+
+# Compiled lazily (on the first sweep): loading a parallel kernel starts numba's threading layer,
+# which can make forked processes (e.g. the `cerebro.optstrategy` pool) hang on exit
+@njit(cache=True, parallel=True)
+def _sweep(
+    close,
+    open_,
+    buy_signals,
+    sell_signals,
+    init_cash,
+    buy_props,
+    sell_props,
+    comm,
+    exec_closes,
+):
+    """
+    Runs `_simulate` for every parameter combination in parallel (one row of signals and settings per combination)
+
+    Returns
+    -------
+    np.ndarray
+        One row per combination: final portfolio value, number of trades, max drawdown
+    """
+    n_combos = buy_signals.shape[0]
+    out = np.empty((n_combos, 3))
+    for k in prange(n_combos):
+        equity, trades = _simulate(
+            close,
+            open_,
+            buy_signals[k],
+            sell_signals[k],
+            init_cash,
+            buy_props[k],
+            sell_props[k],
+            comm,
+            exec_closes[k],
+        )
+        peak = equity[0]
+        max_drawdown = 0.0
+        for value in equity:
+            peak = max(peak, value)
+            max_drawdown = max(max_drawdown, (peak - value) / peak)
+        out[k, 0] = equity[-1]
+        out[k, 1] = trades.shape[0]
+        out[k, 2] = max_drawdown
+    return out
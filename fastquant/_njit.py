@@ -0,0 +1,46 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import warnings
+
+# Backend of the simulation kernels, selected with the FASTQUANT_ENGINE environment variable:
+# "numba" (default) compiles them, "python" runs them as plain python (no compilation pause, but slower)
+ENGINES = ("numba", "python")
+ENGINE = os.environ.get("FASTQUANT_ENGINE", "numba")
+if ENGINE not in ENGINES:
+    # Only warn, so a bad setting doesn't break `import fastquant` for code that never runs a kernel
+    warnings.warn(
+        "FASTQUANT_ENGINE should be one of {}, got '{}': using 'numba'".format(
+            ENGINES, ENGINE
+        )
+    )
+    ENGINE = "numba"
+
+if ENGINE == "numba":
+    try:
+        from numba import njit, prange, threading_layer
+    except ImportError:  # pragma: no cover
+        # Without numba, the decorated functions run as plain python (slower, but same results)
+        ENGINE = "python"
+
+if ENGINE == "python":
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+
+def parallel_layer_started():
+    """
+    True once a parallel kernel has started numba's threading layer, after which forked processes can hang on exit
+    """
+    if ENGINE != "numba":
+        return False
+    try:
+        threading_layer()
+    except ValueError:
+        return False
+    return True
@@ -0,0 +1,70 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+def to_soa(df, columns=None, dtype=np.float64, dt=None):
+    """
+    Converts a price dataframe into separate C-contiguous arrays, one per column (structure of arrays)
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Price data
+    columns : dict, optional
+        Maps the name of each array to its column in `df`, either a position (int) or a label.
+        Defaults to the ohlcv columns present in `df`
+    dtype : np.dtype, optional
+        Type of the arrays, np.float32 halves their memory at the cost of precision (default: np.float64)
+    dt : int or str, optional
+        Position or label of the datetime column. If given, its timestamps are added under "dt" as int64 nanoseconds
+
+    Returns
+    -------
+    dict
+        Maps each name to its (writable) array
+    """
+    if columns is None:
+        columns = {col: col for col in OHLCV_COLUMNS if col in df.columns}
+
+    soa = {}
+    for name, col in columns.items():
+        series = df.iloc[:, col] if isinstance(col, int) else df[col]
+        soa[name] = np.array(series, dtype=dtype, order="C")
+    if dt is not None:
+        series = df.iloc[:, dt] if isinstance(dt, int) else df[dt]
+        soa["dt"] = np.array(series, dtype="datetime64[ns]").view("i8")
+    return soa
+
+
+def date_range_index(timestamps_i8, start=None, end=None):
+    """
+    Index bounds of the periods between `start` and `end` (both inclusive), found with a binary search
+
+    Parameters
+    ----------
+    timestamps_i8 : np.ndarray
+        Sorted timestamps as int64 nanoseconds (the "dt" array of `to_soa`)
+    start : str or datetime, optional
+        First date to include (default: the first period)
+    end : str or datetime, optional
+        Last date to include (default: the last period)
+
+    Returns
+    -------
+    tuple
+        (start index, end index), to be used as `array[start:end]`
+    """
+    lo = 0
+    hi = len(timestamps_i8)
+    if start is not None:
+        lo = np.searchsorted(timestamps_i8, np.datetime64(start, "ns").astype("i8"))
+    if end is not None:
+        hi = np.searchsorted(
+            timestamps_i8, np.datetime64(end, "ns").astype("i8"), side="right"
+        )
+    if lo >= hi:
+        raise ValueError("No data between {} and {}".format(start, end))
+    return lo, hi
@@ -0,0 +1,56 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import datetime
+import backtrader as bt
+
+from .data import to_soa
+
+# Ordinal of 1970-01-01, as used by `bt.date2num`
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+NANOSECONDS_PER_DAY = 86400 * 10 ** 9
+
+
+class NumpyArrayData(bt.feeds.DataBase):
+    """
+    Data feed that loads each period from precomputed arrays, instead of indexing a dataframe like `bt.feeds.PandasData`
+
+    `dataname` is a dict of equally long arrays, as returned by `to_soa`: "dt" (int64 nanoseconds)
+    and any of the open, high, low, close, volume and openinterest lines. Missing lines are left as NaN.
+    """
+
+    @classmethod
+    def from_df(cls, df, data_format_mapping, **kwargs):
+        """
+        Creates the feed from a dataframe, using a data format mapping (see `DATA_FORMAT_MAPPING`)
+        """
+        columns = {
+            name: col
+            for name, col in data_format_mapping.items()
+            if name != "datetime" and col is not None
+        }
+        arrays = to_soa(df, columns, dt=data_format_mapping["datetime"])
+        return cls(dataname=arrays, **kwargs)
+
+    def start(self):
+        super(NumpyArrayData, self).start()
+        arrays = self.p.dataname
+        # Datetimes converted to the float format of backtrader (`bt.date2num`) all at once
+        self._dt = (arrays["dt"] / NANOSECONDS_PER_DAY + EPOCH_ORDINAL).tolist()
+        # Plain lists, since indexing them is cheaper than indexing numpy arrays element by element
+        self._columns = [
+            (getattr(self.lines, name), array.tolist())
+            for name, array in arrays.items()
+            if name != "dt"
+        ]
+        self._idx = 0
+
+    def _load(self):
+        i = self._idx
+        if i >= len(self._dt):
+            return False
+
+        self.lines.datetime[0] = self._dt[i]
+        for line, values in self._columns:
+            line[0] = values[i]
+        self._idx += 1
+        return True
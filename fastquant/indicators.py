@@ -0,0 +1,101 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import math
+import numpy as np
+import pandas as pd
+
+
+def rsi_wilder(close, period):
+    """
+    Relative Strength Index computed over the whole price array at once
+
+    Uses Wilder's smoothing seeded with the simple average of the first `period` price changes,
+    which gives the same values as `bt.indicators.RelativeStrengthIndex`
+
+    Parameters
+    ----------
+    close : np.ndarray
+        Closing prices
+    period : int
+        Period used as basis in computing RSI
+
+    Returns
+    -------
+    np.ndarray
+        RSI per period (NaN for the first `period` periods)
+    """
+    close = np.asarray(close, dtype=np.float64)
+    rsi = np.full(len(close), np.nan)
+    if len(close) <= period:
+        return rsi
+
+    delta = np.diff(close, prepend=close[0])
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    gain[period] = gain[1 : period + 1].mean()
+    loss[period] = loss[1 : period + 1].mean()
+    avg_gain = pd.Series(gain[period:]).ewm(alpha=1 / period, adjust=False).mean()
+    avg_loss = pd.Series(loss[period:]).ewm(alpha=1 / period, adjust=False).mean()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain.to_numpy() / avg_loss.to_numpy()
+    rsi[period:] = 100 - 100 / (1 + rs)
+    return rsi
+
+
+def sma_cumsum(x, w):
+    """
+    Simple moving average computed in O(N) from a single cumulative sum
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Input series
+    w : int
+        Window size
+
+    Returns
+    -------
+    np.ndarray
+        Moving average per period (NaN for the first `w - 1` periods)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    sma = np.full(len(x), np.nan)
+    if len(x) < w:
+        return sma
+
+    cumsum = np.cumsum(x)
+    sma[w - 1 :] = (cumsum[w - 1 :] - np.concatenate(([0.0], cumsum[:-w]))) / w
+    return sma
+
+
+def crossover(fast, slow):
+    """
+    Crossover events between two series, same as `bt.ind.CrossOver`
+
+    Returns 1 on the periods where `fast` crosses above `slow`, -1 where it crosses below, and 0 otherwise.
+    Periods where both series are equal do not break a crossover, as the comparison is made against the last non-zero difference.
+    """
+    sign = np.sign(np.asarray(fast) - np.asarray(slow))
+    # Carry forward the last non-zero sign
+    last_idx = np.maximum.accumulate(np.where(sign != 0, np.arange(len(sign)), 0))
+    prev_sign = np.concatenate(([0.0], sign[last_idx][:-1]))
+    return np.where(
+        (prev_sign < 0) & (sign > 0), 1, np.where((prev_sign > 0) & (sign < 0), -1, 0)
+    )
+
+
+def sma_crossover(close, fast_period, slow_period):
+    """
+    Crossover events between a fast and a slow simple moving average, same as `bt.ind.CrossOver` of two `bt.ind.SMA`
+
+    The averages come from `sma_cumsum`, whose rounding errors can flip the sign of their difference where both are equal.
+    Those periods are recomputed with `math.fsum`, as in `bt.ind.SMA`, so the ties are broken the same way
+    """
+    close = np.asarray(close, dtype=np.float64)
+    sma_fast = sma_cumsum(close, fast_period)
+    sma_slow = sma_cumsum(close, slow_period)
+    ties = np.flatnonzero(np.abs(sma_fast - sma_slow) <= 1e-9 * np.abs(sma_slow))
+    for i in ties:
+        sma_fast[i] = math.fsum(close[i - fast_period + 1 : i + 1]) / fast_period
+        sma_slow[i] = math.fsum(close[i - slow_period + 1 : i + 1]) / slow_period
+    return crossover(sma_fast, sma_slow)
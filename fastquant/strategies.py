@@ -1,18 +1,33 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 import datetime
+import logging
 import os.path
 import sys
+import warnings
 import backtrader as bt
 import backtrader.feeds as btfeed
+import numpy as np
 import pandas as pd
 
+from ._fast_sim import _simulate
+from ._njit import parallel_layer_started
+from .data import date_range_index, to_soa
+from .feeds import NumpyArrayData
+from .indicators import rsi_wilder, sma_crossover
+
+logger = logging.getLogger(__name__)
+
 # Global arguments
 INIT_CASH = 100000
 COMMISSION_PER_TRANSACTION = 0.0075
 DATA_FILE = "examples/data/JFC_20180101_20190110_DCV.csv"
 BUY_PROP = 1
 SELL_PROP = 1
+# Engines accepted by `backtest()`
+BACKTEST_ENGINES = ("backtrader", "numba")
+# Types of the price arrays supported by the numba engine
+PRICE_DTYPES = ("f8", "f4")
 DATA_FORMAT_MAPPING = {
     "dcv": {
         "datetime": 0,
@@ -22,8 +37,43 @@ DATA_FORMAT_MAPPING = {
         "close": 1,
         "volume": 2,
         "openinterest": None,
-    }
+    },
+    # Layout of the PSE csv files (dt, open, high, low, close, value), e.g. examples/data/*_OHLCV.csv
+    "ohlcv": {
+        "datetime": 0,
+        "open": 1,
+        "high": 2,
+        "low": 3,
+        "close": 4,
+        "volume": 5,
+        "openinterest": None,
+    },
 }
+# Columns read from csv files (besides the `dt` column) and their types, per data format
+DATA_FORMAT_DTYPES = {
+    "dcv": {"close": "float64", "volume": "float64"},
+    "ohlcv": {
+        "open": "float64",
+        "high": "float64",
+        "low": "float64",
+        "close": "float64",
+        "value": "float64",
+    },
+}
+
+
+def read_data_csv(path, data_format="dcv"):
+    """
+    Reads a csv file of the given data format, with explicit column types so pandas doesn't have to infer them
+    """
+    dtypes = DATA_FORMAT_DTYPES[data_format]
+    return pd.read_csv(
+        path,
+        header=0,
+        usecols=["dt"] + list(dtypes.keys()),
+        dtype=dtypes,
+        parse_dates=["dt"],
+    )
 
 
 def docstring_parameter(*sub):
@@ -46,6 +96,8 @@ class BaseStrategy(bt.Strategy):
         ("init_cash", INIT_CASH),
         ("buy_prop", BUY_PROP),
         ("sell_prop", SELL_PROP),
+        # Commission per transaction set in the broker, used to size the buys
+        ("commission", COMMISSION_PER_TRANSACTION),
         (
             "execution_type",
             "close",
@@ -58,26 +110,48 @@ class BaseStrategy(bt.Strategy):
         dt = dt or self.datas[0].datetime.date(0)
         print("%s, %s" % (dt.isoformat(), txt))
 
+    def _log_args(self, txt, *args):
+        # Formats the message only when the log is actually written
+        self.log(txt % args)
+
+    def _log_noop(self, txt, *args):
+        pass
+
     def __init__(self):
         # Global variables
         self.init_cash = self.params.init_cash
         self.buy_prop = self.params.buy_prop
         self.sell_prop = self.params.sell_prop
+        self.commission = self.params.commission
         self.execution_type = self.params.execution_type
         self.periodic_logging = self.params.periodic_logging
         self.transaction_logging = self.params.transaction_logging
-        print("===Global level arguments===")
-        print("init_cash : {}".format(self.init_cash))
-        print("buy_prop : {}".format(self.buy_prop))
-        print("sell_prop : {}".format(self.sell_prop))
+        # Bind the loggers once, so disabled logging costs no check (or message formatting) per period
+        # (arguments that are costly to look up, like the position or line values, are still guarded by a flag check)
+        self._tx_log = self._log_args if self.transaction_logging else self._log_noop
+        self._period_log = self._log_args if self.periodic_logging else self._log_noop
+        logger.debug("===Global level arguments===")
+        logger.debug("init_cash : %s", self.init_cash)
+        logger.debug("buy_prop : %s", self.buy_prop)
+        logger.debug("sell_prop : %s", self.sell_prop)
+        logger.debug("commission : %s", self.commission)
 
         self.dataclose = self.datas[0].close
         self.dataopen = self.datas[0].open
         self.order = None
         self.buyprice = None
         self.buycomm = None
+        # Reciprocal of the price multiplier for the afforded size (commission per transaction plus allowance)
+        self._inv_price_mult = 1 / (1 + self.commission + 0.001)
+        # Bind the order functions for the execution type once, instead of checking it every period
+        if self.execution_type == "close":
+            self._do_buy = self._buy_close
+            self._do_sell = self._sell_close
+        else:
+            self._do_buy = self._buy_open
+            self._do_sell = self._sell_open
         # Number of ticks in the input data
-        self.len_data = len(list(self.datas[0]))
+        self.len_data = self.datas[0].buflen()
 
     def buy_signal(self):
         return True
@@ -85,34 +159,35 @@ class BaseStrategy(bt.Strategy):
     def sell_signal(self):
         return True
 
+    @classmethod
+    def fast_signals(cls, close, params):
+        """
+        Buy and sell signals over the whole `close` array, used by the numba engine in place of `buy_signal` and `sell_signal`
+        """
+        return np.ones(len(close), dtype=bool), np.ones(len(close), dtype=bool)
+
     def notify_order(self, order):
         if order.status in [order.Submitted, order.Accepted]:
             return
 
         if order.status in [order.Completed]:
             if order.isbuy():
-                if self.transaction_logging:
-                    self.log(
-                        "BUY EXECUTED, Price: %.2f, Cost: %.2f, Comm %.2f"
-                        % (
-                            order.executed.price,
-                            order.executed.value,
-                            order.executed.comm,
-                        )
-                    )
+                self._tx_log(
+                    "BUY EXECUTED, Price: %.2f, Cost: %.2f, Comm %.2f",
+                    order.executed.price,
+                    order.executed.value,
+                    order.executed.comm,
+                )
 
                 self.buyprice = order.executed.price
                 self.buycomm = order.executed.comm
             else:  # Sell
-                if self.transaction_logging:
-                    self.log(
-                        "SELL EXECUTED, Price: %.2f, Cost: %.2f, Comm %.2f"
-                        % (
-                            order.executed.price,
-                            order.executed.value,
-                            order.executed.comm,
-                        )
-                    )
+                self._tx_log(
+                    "SELL EXECUTED, Price: %.2f, Cost: %.2f, Comm %.2f",
+                    order.executed.price,
+                    order.executed.value,
+                    order.executed.comm,
+                )
 
             self.bar_executed = len(self)
 
@@ -131,97 +206,87 @@ class BaseStrategy(bt.Strategy):
     def notify_trade(self, trade):
         if not trade.isclosed:
             return
-        if self.transaction_logging:
-            self.log(
-                "OPERATION PROFIT, GROSS %.2f, NET %.2f" % (trade.pnl, trade.pnlcomm)
-            )
+        self._tx_log("OPERATION PROFIT, GROSS %.2f, NET %.2f", trade.pnl, trade.pnlcomm)
 
     def notify_cashvalue(self, cash, value):
         # Update cash and value every period
-        if self.periodic_logging:
-            self.log("Cash %s Value %s" % (cash, value))
+        self._period_log("Cash %s Value %s", cash, value)
         self.cash = cash
         self.value = value
+        self._stock_value = value - cash
 
     def next(self):
-        if self.periodic_logging:
-            self.log("Close, %.2f" % self.dataclose[0])
+        # Bind the per period values to locals to avoid repeated attribute lookups
+        close0 = self.dataclose[0]
+        cash = self.cash
+
+        self._period_log("Close, %.2f", close0)
         if self.order:
             return
 
         # Skip the last observation since purchases are based on next day closing prices (no value for the last observation)
-        if len(self) + 1 >= self.len_data:
+        if len(self) >= self.len_data:
             return
 
+        # Guarded so the position isn't looked up every period when periodic logging is off
         if self.periodic_logging:
             self.log("CURRENT POSITION SIZE: {}".format(self.position.size))
         # Only buy if there is enough cash for at least one stock
-        if self.cash >= self.dataclose[0]:
-            if self.buy_signal():
-
-                if self.transaction_logging:
-                    self.log("BUY CREATE, %.2f" % self.dataclose[0])
-                # Take a 10% long position every time it's a buy signal (or whatever is afforded by the current cash position)
-                # "size" refers to the number of stocks to purchase
-                # Afforded size is based on closing price for the current trading day
-                # Margin is required for buy commission
-                # Add allowance to commission per transaction (avoid margin)
-                afforded_size = int(
-                    self.cash
-                    / (self.dataclose[0] * (1 + COMMISSION_PER_TRANSACTION + 0.001))
-                )
-                buy_prop_size = int(afforded_size * self.buy_prop)
-                # Buy based on the closing price of the next closing day
-                if self.execution_type == "close":
-                    final_size = min(buy_prop_size, afforded_size,)
-                    if self.transaction_logging:
-                        self.log("Cash: {}".format(self.cash))
-                        self.log("Price: {}".format(self.dataclose[0]))
-                        self.log("Buy prop size: {}".format(buy_prop_size))
-                        self.log("Afforded size: {}".format(afforded_size))
-                        self.log("Final size: {}".format(final_size))
-                    # Explicitly setting exectype=bt.Order.Close will make the next day's closing the reference price
-                    self.order = self.buy(size=final_size)
-                # Buy based on the opening price of the next closing day (only works "open" data exists in the dataset)
-                else:
-                    # Margin is required for buy commission
-                    afforded_size = int(
-                        self.cash
-                        / (self.dataopen[1] * (1 + COMMISSION_PER_TRANSACTION + 0.001))
-                    )
-                    final_size = min(buy_prop_size, afforded_size,)
-                    if self.transaction_logging:
-                        self.log("Buy prop size: {}".format(buy_prop_size))
-                        self.log("Afforded size: {}".format(afforded_size))
-                        self.log("Final size: {}".format(final_size))
-                    self.order = self.buy(size=final_size,)
+        # Check the cash before the signal, so the signal is only computed when a buy is possible
+        if cash >= close0 and self.buy_signal():
+            self._tx_log("BUY CREATE, %.2f", close0)
+            # Take a 10% long position every time it's a buy signal (or whatever is afforded by the current cash position)
+            # "size" refers to the number of stocks to purchase
+            # Afforded size is based on closing price for the current trading day
+            # Margin is required for buy commission
+            # Add allowance to commission per transaction (avoid margin)
+            afforded_size = int(cash * self._inv_price_mult / close0)
+            buy_prop_size = int(afforded_size * self.buy_prop)
+            self._do_buy(afforded_size, buy_prop_size)
 
         # Only sell if you hold least one unit of the stock (and sell only that stock, so no short selling)
-        stock_value = self.value - self.cash
-        if stock_value > 0:
-            if self.sell_signal():
-                if self.transaction_logging:
-                    self.log("SELL CREATE, %.2f" % self.dataclose[1])
-                # Sell a 5% sell position (or whatever is afforded by the current stock holding)
-                # "size" refers to the number of stocks to purchase
-                if self.execution_type == "close":
-                    if SELL_PROP == 1:
-                        self.order = self.sell(
-                            size=self.position.size, exectype=bt.Order.Close,
-                        )
-                    else:
-                        # Sell based on the closing price of the next closing day
-                        self.order = self.sell(
-                            size=int(
-                                (stock_value / (self.dataclose[1])) * self.sell_prop
-                            ),
-                            exectype=bt.Order.Close,
-                        )
-                else:
-                    # Sell based on the opening price of the next closing day (only works "open" data exists in the dataset)
-                    self.order = self.sell(
-                        size=int((self.init_cash / self.dataopen[1]) * self.sell_prop),
-                    )
+        if self._stock_value > 0 and self.sell_signal():
+            # Guarded so the next close isn't looked up when transaction logging is off
+            if self.transaction_logging:
+                self.log("SELL CREATE, %.2f" % self.dataclose[1])
+            # Sell a 5% sell position (or whatever is afforded by the current stock holding)
+            # "size" refers to the number of stocks to purchase
+            self._do_sell()
+
+    def _buy_close(self, afforded_size, buy_prop_size):
+        # Buy based on the closing price of the next closing day
+        final_size = min(buy_prop_size, afforded_size,)
+        if self.transaction_logging:
+            self.log("Cash: {}".format(self.cash))
+            self.log("Price: {}".format(self.dataclose[0]))
+            self.log("Buy prop size: {}".format(buy_prop_size))
+            self.log("Afforded size: {}".format(afforded_size))
+            self.log("Final size: {}".format(final_size))
+        # Explicitly setting exectype=bt.Order.Close will make the next day's closing the reference price
+        self.order = self.buy(size=final_size)
+
+    def _buy_open(self, afforded_size, buy_prop_size):
+        # Buy based on the opening price of the next closing day (only works "open" data exists in the dataset)
+        # Margin is required for buy commission
+        afforded_size = int(self.cash * self._inv_price_mult / self.dataopen[1])
+        final_size = min(buy_prop_size, afforded_size,)
+        if self.transaction_logging:
+            self.log("Buy prop size: {}".format(buy_prop_size))
+            self.log("Afforded size: {}".format(afforded_size))
+            self.log("Final size: {}".format(final_size))
+        # coc=False fills the order at the next opening price, instead of the closing price (cheat-on-close)
+        self.order = self.buy(size=final_size, coc=False)
+
+    def _sell_close(self):
+        # Sell a `sell_prop` proportion of the position, based on the closing price of the next closing day
+        self.order = self.sell(
+            size=int(self.position.size * self.sell_prop), exectype=bt.Order.Close
+        )
+
+    def _sell_open(self):
+        # Sell a `sell_prop` proportion of the position, based on the opening price of the next closing day
+        # (only works "open" data exists in the dataset)
+        self.order = self.sell(size=int(self.position.size * self.sell_prop), coc=False)
 
 
 class RSIStrategy(BaseStrategy):
@@ -252,10 +317,10 @@ class RSIStrategy(BaseStrategy):
         self.rsi_period = self.params.rsi_period
         self.rsi_upper = self.params.rsi_upper
         self.rsi_lower = self.params.rsi_lower
-        print("===Strategy level arguments===")
-        print("rsi_period :", self.rsi_period)
-        print("rsi_upper :", self.rsi_upper)
-        print("rsi_lower :", self.rsi_lower)
+        logger.debug("===Strategy level arguments===")
+        logger.debug("rsi_period : %s", self.rsi_period)
+        logger.debug("rsi_upper : %s", self.rsi_upper)
+        logger.debug("rsi_lower : %s", self.rsi_lower)
         self.rsi = bt.indicators.RelativeStrengthIndex(period=self.rsi_period)
 
     def buy_signal(self):
@@ -264,6 +329,11 @@ class RSIStrategy(BaseStrategy):
     def sell_signal(self):
         return self.rsi[0] > self.rsi_upper
 
+    @classmethod
+    def fast_signals(cls, close, params):
+        rsi = rsi_wilder(close, params["rsi_period"])
+        return rsi < params["rsi_lower"], rsi > params["rsi_upper"]
+
 
 class SMACStrategy(BaseStrategy):
     """
@@ -290,9 +360,9 @@ class SMACStrategy(BaseStrategy):
         self.fast_period = self.params.fast_period
         self.slow_period = self.params.slow_period
 
-        print("===Strategy level arguments===")
-        print("fast_period :", self.fast_period)
-        print("slow_period :", self.slow_period)
+        logger.debug("===Strategy level arguments===")
+        logger.debug("fast_period : %s", self.fast_period)
+        logger.debug("slow_period : %s", self.slow_period)
         sma_fast = bt.ind.SMA(period=self.fast_period)  # fast moving average
         sma_slow = bt.ind.SMA(period=self.slow_period)  # slow moving average
         self.crossover = bt.ind.CrossOver(sma_fast, sma_slow)  # crossover signal
@@ -303,6 +373,11 @@ class SMACStrategy(BaseStrategy):
     def sell_signal(self):
         return self.crossover < 0
 
+    @classmethod
+    def fast_signals(cls, close, params):
+        cross = sma_crossover(close, params["fast_period"], params["slow_period"])
+        return cross > 0, cross < 0
+
 
 STRATEGY_MAPPING = {"rsi": RSIStrategy, "smac": SMACStrategy, "base": BaseStrategy}
 
@@ -311,6 +386,37 @@ strat_docs = "\nExisting strategies:\n\n" + "\n".join(
 )
 
 
+class FinalValue(bt.Analyzer):
+    """
+    Portfolio value at the end of the backtest (kept in the results of optimization runs, unlike the broker)
+    """
+
+    def stop(self):
+        self.rets["final_value"] = self.strategy.broker.getvalue()
+
+
+def _init_cerebro(data, commission, init_cash, data_format, **cerebro_kwargs):
+    """
+    Cerebro with the data feed, commission and cash set up (strategies and observers are added by the caller)
+    """
+    cerebro = bt.Cerebro(stdstats=False, **cerebro_kwargs)
+    cerebro.broker.setcommission(commission=commission)
+
+    # Treat `data` as a path if it's a string; otherwise, it's treated as a pandas dataframe
+    if isinstance(data, str):
+        logger.debug("Reading path as pandas dataframe ...")
+        data = read_data_csv(data, data_format)
+
+    pd_data = NumpyArrayData.from_df(data, DATA_FORMAT_MAPPING[data_format])
+
+    cerebro.adddata(pd_data)
+    cerebro.broker.setcash(init_cash)
+    # Allows us to set buy price based on next day closing
+    # (technically impossible, but reasonable assuming you use all your money to buy market at the end of the next day)
+    cerebro.broker.set_coc(True)
+    return cerebro
+
+
 @docstring_parameter(strat_docs)
 def backtest(
     strategy,
@@ -319,33 +425,50 @@ def backtest(
     init_cash=INIT_CASH,
     data_format="dcv",
     plot=True,
+    engine="backtrader",
+    dtype="f8",
     **kwargs
 ):
     """
     Backtest financial data with a specified trading strategy
+
+    Set `engine="numba"` to run the simulation on precomputed arrays instead of backtrader (requires `plot=False`),
+    with prices stored as `dtype` ("f8" or "f4", the backtrader engine only supports "f8")
     
     {0}
     """
 
-    cerebro = bt.Cerebro(stdstats=False)
-    cerebro.addobserver(bt.observers.Broker)
-    cerebro.addobserver(bt.observers.Trades)
-    cerebro.addobserver(bt.observers.BuySell)
-    cerebro.addstrategy(STRATEGY_MAPPING[strategy], init_cash=init_cash, **kwargs)
-    cerebro.broker.setcommission(commission=commission)
-
-    # Treat `data` as a path if it's a string; otherwise, it's treated as a pandas dataframe
-    if isinstance(data, str):
-        print("Reading path as pandas dataframe ...")
-        data = pd.read_csv(data, header=0, parse_dates=["dt"])
-
-    pd_data = bt.feeds.PandasData(dataname=data, **DATA_FORMAT_MAPPING[data_format])
+    if engine not in BACKTEST_ENGINES:
+        raise ValueError(
+            "engine should be one of {}, got '{}'".format(BACKTEST_ENGINES, engine)
+        )
+    if engine == "backtrader" and dtype != "f8":
+        raise ValueError(
+            "The backtrader engine only supports dtype='f8', got '{}'".format(dtype)
+        )
+    if engine == "numba":
+        if plot:
+            raise ValueError("The numba engine can't plot, set plot=False")
+        return backtest_fast(
+            strategy,
+            data,
+            commission=commission,
+            init_cash=init_cash,
+            data_format=data_format,
+            dtype=dtype,
+            **kwargs
+        )
+
+    cerebro = _init_cerebro(data, commission, init_cash, data_format)
+    # Observers are only needed for the plot
+    if plot:
+        cerebro.addobserver(bt.observers.Broker)
+        cerebro.addobserver(bt.observers.Trades)
+        cerebro.addobserver(bt.observers.BuySell)
+    cerebro.addstrategy(
+        STRATEGY_MAPPING[strategy], init_cash=init_cash, commission=commission, **kwargs
+    )
 
-    cerebro.adddata(pd_data)
-    cerebro.broker.setcash(init_cash)
-    # Allows us to set buy price based on next day closing
-    # (technically impossible, but reasonable assuming you use all your money to buy market at the end of the next day)
-    cerebro.broker.set_coc(True)
     print("Starting Portfolio Value: %.2f" % cerebro.broker.getvalue())
     cerebro.run()
     print("Final Portfolio Value: %.2f" % cerebro.broker.getvalue())
@@ -353,17 +476,183 @@ def backtest(
         cerebro.plot(figsize=(30, 15))
 
 
+def backtest_many(
+    strategy,
+    data,  # Treated as csv path is str, and dataframe of pd.DataFrame
+    param_grid,
+    commission=COMMISSION_PER_TRANSACTION,
+    init_cash=INIT_CASH,
+    data_format="dcv",
+    maxcpus=None,
+    **kwargs
+):
+    """
+    Backtest every combination of strategy parameters with backtrader, loading the data only once
+
+    Uses `cerebro.optstrategy`, which shares the preloaded data feed across the runs
+    and spreads them over multiple processes (up to `maxcpus`, default: all cores).
+    The runs stay in the current process once a parallel numba kernel (e.g. `grid_backtest`) has been run,
+    since forking after numba has started its threads can make the interpreter hang on exit
+
+    Parameters
+    ----------
+    strategy : str
+        Key of the strategy in `STRATEGY_MAPPING` (e.g. "rsi", "smac")
+    data : str or pd.DataFrame
+        Path to a csv file, or a dataframe in the given `data_format`
+    param_grid : dict
+        Maps a strategy parameter name to the list of values to try (e.g. {"rsi_period": range(5, 30)})
+    kwargs
+        Strategy parameters shared by all the runs (transaction logging is off unless set here)
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per combination, with the parameter values, final_value and max_drawdown
+    """
+
+    if maxcpus != 1 and parallel_layer_started():
+        warnings.warn(
+            "numba's threading layer is running, so backtest_many() runs in a single process"
+        )
+        maxcpus = 1
+    cerebro = _init_cerebro(data, commission, init_cash, data_format, maxcpus=maxcpus)
+    cerebro.addanalyzer(FinalValue, _name="final_value")
+    cerebro.addanalyzer(bt.analyzers.DrawDown, _name="drawdown")
+    kwargs.setdefault("transaction_logging", False)
+    cerebro.optstrategy(
+        STRATEGY_MAPPING[strategy],
+        init_cash=init_cash,
+        commission=commission,
+        **dict(kwargs, **param_grid)
+    )
+
+    rows = []
+    # Each run returns the list of its strategies (only one here)
+    for (strat,) in cerebro.run():
+        row = {key: getattr(strat.params, key) for key in param_grid}
+        row["final_value"] = strat.analyzers.final_value.get_analysis()["final_value"]
+        row["max_drawdown"] = strat.analyzers.drawdown.get_analysis().max.drawdown / 100
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def _price_arrays(data, data_format, exec_close, dtype="f8"):
+    """
+    Datetime (int64 nanoseconds), close and open arrays used by the numba engine, with prices stored as `dtype` ("f8" or "f4")
+    """
+    # The kernels are only compiled for these types
+    if dtype not in PRICE_DTYPES:
+        raise ValueError(
+            "dtype should be one of {}, got '{}'".format(PRICE_DTYPES, dtype)
+        )
+
+    # Treat `data` as a path if it's a string; otherwise, it's treated as a pandas dataframe
+    if isinstance(data, str):
+        logger.debug("Reading path as pandas dataframe ...")
+        data = read_data_csv(data, data_format)
+
+    data_format_mapping = DATA_FORMAT_MAPPING[data_format]
+    soa = to_soa(
+        data,
+        {
+            name: col
+            for name, col in data_format_mapping.items()
+            if name in ("open", "close") and col is not None
+        },
+        dtype=np.dtype(dtype),
+        dt=data_format_mapping["datetime"],
+    )
+    dt = soa["dt"]
+    close = soa["close"]
+    if "open" in soa:
+        open_ = soa["open"]
+    elif exec_close:
+        open_ = np.full_like(close, np.nan)
+    else:
+        raise ValueError(
+            "execution_type 'open' requires open prices, which are missing from data_format '{}'".format(
+                data_format
+            )
+        )
+
+    return dt, close, open_
+
+
+def backtest_fast(
+    strategy,
+    data,  # Treated as csv path is str, and dataframe of pd.DataFrame
+    commission=COMMISSION_PER_TRANSACTION,
+    init_cash=INIT_CASH,
+    data_format="dcv",
+    dtype="f8",
+    start_date=None,
+    end_date=None,
+    **kwargs
+):
+    """
+    Backtest financial data with a specified trading strategy, using the numba engine
+
+    Prices are stored as `dtype`: "f8" (default) or "f4", which halves their memory at the cost of precision
+
+    Only the periods between `start_date` and `end_date` (both inclusive) are traded,
+    while the strategy indicators are computed on the full data
+
+    Returns the portfolio value per period (pd.Series) and the executed trades (pd.DataFrame)
+    """
+
+    strategy_class = STRATEGY_MAPPING[strategy]
+    params = dict(strategy_class.params._getpairs())
+    # Same check as backtrader does when instantiating the strategy
+    unknown = set(kwargs) - set(params)
+    if unknown:
+        raise TypeError(
+            "Unexpected parameters for strategy '{}': {}".format(
+                strategy, sorted(unknown)
+            )
+        )
+    params.update(init_cash=init_cash, commission=commission, **kwargs)
+
+    exec_close = params["execution_type"] == "close"
+    dt, close, open_ = _price_arrays(data, data_format, exec_close, dtype)
+
+    buy_signals, sell_signals = strategy_class.fast_signals(close, params)
+    start, end = date_range_index(dt, start_date, end_date)
+    dt, close, open_ = dt[start:end], close[start:end], open_[start:end]
+    buy_signals, sell_signals = buy_signals[start:end], sell_signals[start:end]
+
+    print("Starting Portfolio Value: %.2f" % init_cash)
+    equity, trades = _simulate(
+        close,
+        open_,
+        buy_signals,
+        sell_signals,
+        float(init_cash),
+        float(params["buy_prop"]),
+        float(params["sell_prop"]),
+        float(commission),
+        exec_close,
+    )
+    print("Final Portfolio Value: %.2f" % equity[-1])
+
+    dt = pd.to_datetime(dt)
+    equity = pd.Series(equity, index=dt, name="value")
+    trades = pd.DataFrame(trades, columns=["bar", "size", "price", "commission"])
+    trades["dt"] = dt[trades["bar"].astype(int)]
+    return equity, trades
+
+
 if __name__ == "__main__":
     print("Testing RSI strategy with csv ...")
     backtest("rsi", DATA_FILE, plot=False)
     print("Testing RSI strategy with dataframe ...")
-    data = pd.read_csv(DATA_FILE, header=0, parse_dates=["dt"])
+    data = read_data_csv(DATA_FILE)
     backtest("rsi", data, plot=True)
 
     print("Testing SMAC strategy with dataframe ...")
-    data = pd.read_csv(DATA_FILE, header=0, parse_dates=["dt"])
+    data = read_data_csv(DATA_FILE)
     backtest("smac", data, plot=False)
 
     print("Testing Base strategy with dataframe ...")
-    data = pd.read_csv(DATA_FILE, header=0, parse_dates=["dt"])
+    data = read_data_csv(DATA_FILE)
     backtest("base", data, plot=False)
@@ -0,0 +1,89 @@
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import itertools
+import numpy as np
+import pandas as pd
+
+from ._fast_sim import _sweep
+from .data import date_range_index
+from .strategies import (
+    COMMISSION_PER_TRANSACTION,
+    INIT_CASH,
+    STRATEGY_MAPPING,
+    _price_arrays,
+)
+
+
+def grid_backtest(
+    strategy,
+    data,  # Treated as csv path is str, and dataframe of pd.DataFrame
+    param_grid,
+    commission=COMMISSION_PER_TRANSACTION,
+    init_cash=INIT_CASH,
+    data_format="dcv",
+    dtype="f8",
+    start_date=None,
+    end_date=None,
+):
+    """
+    Backtest every combination of strategy parameters with the numba engine, running the combinations in parallel
+
+    Parameters
+    ----------
+    strategy : str
+        Key of the strategy in `STRATEGY_MAPPING` (e.g. "rsi", "smac")
+    data : str or pd.DataFrame
+        Path to a csv file, or a dataframe in the given `data_format`
+    param_grid : dict
+        Maps a strategy parameter name to the list of values to try (e.g. {"rsi_period": [7, 14], "rsi_lower": [20, 30]}),
+        except for init_cash and commission
+    dtype : str
+        Type of the price arrays: "f8" (default) or "f4", which halves their memory at the cost of precision
+    start_date, end_date : str or datetime, optional
+        Only trade the periods between these dates (both inclusive); the indicators are still computed on the full data
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per combination, with the parameter values, final_value, n_trades and max_drawdown
+    """
+
+    strategy_class = STRATEGY_MAPPING[strategy]
+    defaults = dict(strategy_class.params._getpairs())
+    # Cash and commission are shared by all the combinations, so they are set by the arguments instead
+    unknown = set(param_grid) - (set(defaults) - {"init_cash", "commission"})
+    if unknown:
+        raise ValueError(
+            "Unknown parameters for strategy '{}' in param_grid: {}".format(
+                strategy, sorted(unknown)
+            )
+        )
+    defaults.update(init_cash=init_cash, commission=commission)
+
+    keys = list(param_grid.keys())
+    combos = [
+        dict(defaults, **dict(zip(keys, values)))
+        for values in itertools.product(*param_grid.values())
+    ]
+    exec_closes = np.array([p["execution_type"] == "close" for p in combos])
+    dt, close, open_ = _price_arrays(data, data_format, exec_closes.all(), dtype)
+
+    signals = [strategy_class.fast_signals(close, p) for p in combos]
+    start, end = date_range_index(dt, start_date, end_date)
+    metrics = _sweep(
+        close[start:end],
+        open_[start:end],
+        np.array([buy[start:end] for buy, _ in signals]),
+        np.array([sell[start:end] for _, sell in signals]),
+        float(init_cash),
+        np.array([p["buy_prop"] for p in combos], dtype=np.float64),
+        np.array([p["sell_prop"] for p in combos], dtype=np.float64),
+        float(commission),
+        exec_closes,
+    )
+
+    results = pd.DataFrame([{key: p[key] for key in keys} for p in combos])
+    results["final_value"] = metrics[:, 0]
+    results["n_trades"] = metrics[:, 1].astype(int)
+    results["max_drawdown"] = metrics[:, 2]
+    return results
@@ -1,4 +1,8 @@
+import subprocess
+import sys
+import numpy as np
 import pandas as pd
+import pytest
 from fastquant import (
     get_disclosures_df,
     get_pse_data,
@@ -6,8 +10,14 @@ from fastquant import (
     get_stock_data,
     get_company_disclosures,
     pse_data_to_csv,
+    backtest,
+    backtest_fast,
+    backtest_many,
+    grid_backtest,
+    DATA_FILE,
 )
 
+OHLCV_DATA_FILE = "examples/data/JFC_2010-01-01_2019-01-01_OHLCV.csv"
 PHISIX_SYMBOL = "JFC"
 YAHOO_SYMBOL = "GOOGL"
 DATE_START = "2018-01-01"
@@ -43,3 +53,148 @@ def test_get_stock_data():
 def test_get_company_disclosures():
     company_disclosures_df = get_company_disclosures(PHISIX_SYMBOL)
     assert isinstance(company_disclosures_df, pd.DataFrame)
+
+
+def test_backtest_numba_engine():
+    data = pd.read_csv(DATA_FILE, header=0, parse_dates=["dt"])
+    equity, trades = backtest("rsi", data, plot=False, engine="numba")
+    assert isinstance(equity, pd.Series)
+    assert isinstance(trades, pd.DataFrame)
+    assert len(equity) == len(data)
+    assert round(equity.iloc[-1], 2) == 132967.87
+
+
+def test_backtest_invalid_arguments():
+    with pytest.raises(ValueError):
+        backtest("rsi", DATA_FILE, plot=False, engine="numbaa")
+    with pytest.raises(ValueError):
+        backtest("rsi", DATA_FILE, plot=True, engine="numba")
+    with pytest.raises(TypeError):
+        backtest("rsi", DATA_FILE, plot=False, engine="numba", rsi_perod=7)
+    with pytest.raises(ValueError):
+        backtest("rsi", DATA_FILE, plot=False, engine="numba", dtype="i8")
+    with pytest.raises(ValueError):
+        backtest("rsi", DATA_FILE, plot=False, dtype="f4")
+
+
+def test_float32_prices():
+    # On the sample data, float32 prices give the same trades as float64 (up to float32 precision)
+    for strategy in ["base", "rsi", "smac"]:
+        equity, trades = backtest_fast(strategy, DATA_FILE)
+        equity_f4, trades_f4 = backtest_fast(strategy, DATA_FILE, dtype="f4")
+        assert trades[["bar", "size"]].equals(trades_f4[["bar", "size"]])
+        assert np.allclose(trades["price"], trades_f4["price"], rtol=1e-6)
+        assert np.allclose(equity, equity_f4, rtol=1e-6)
+
+    param_grid = {"fast_period": [5, 10], "slow_period": [15, 30]}
+    results = grid_backtest("smac", DATA_FILE, param_grid)
+    results_f4 = grid_backtest("smac", DATA_FILE, param_grid, dtype="f4")
+    assert results["n_trades"].equals(results_f4["n_trades"])
+    assert np.allclose(results["final_value"], results_f4["final_value"], rtol=1e-6)
+
+
+def test_backtest_date_range():
+    data = pd.read_csv(DATA_FILE, header=0, parse_dates=["dt"])
+    # Weekend bounds, so the range starts and ends on the nearest trading days inside it
+    start_date, end_date = "2018-03-03", "2018-09-30"
+    equity, trades = backtest_fast(
+        "smac", DATA_FILE, start_date=start_date, end_date=end_date
+    )
+    assert equity.index[0] == pd.Timestamp("2018-03-05")
+    assert equity.index[-1] == pd.Timestamp("2018-09-28")
+    # The bars are relative to the range; sells are filled at the close of their bar, which should match the date
+    sells = trades[trades["size"] < 0]
+    assert len(sells) > 0
+    close = data.set_index("dt")["close"]
+    assert (close[sells["dt"]].to_numpy() == sells["price"].to_numpy()).all()
+
+    results = grid_backtest(
+        "smac",
+        DATA_FILE,
+        {"fast_period": [10], "slow_period": [30]},
+        start_date=start_date,
+        end_date=end_date,
+    )
+    assert np.isclose(results["final_value"].iloc[0], equity.iloc[-1])
+
+    with pytest.raises(ValueError):
+        backtest_fast("smac", DATA_FILE, start_date="2018-03-03", end_date="2018-03-04")
+
+
+def test_grid_backtest():
+    param_grid = {"fast_period": [5, 10], "slow_period": [15, 30]}
+    results = grid_backtest("smac", DATA_FILE, param_grid)
+    assert isinstance(results, pd.DataFrame)
+    assert len(results) == 4
+    assert round(results["final_value"].iloc[-1], 2) == 103184.34
+    with pytest.raises(ValueError):
+        grid_backtest("rsi", DATA_FILE, {"rsi_perod": [5, 30]})
+
+
+def test_backtest_many():
+    # Run in a fresh interpreter, since the runs stay in a single process once another test has run a parallel kernel
+    script = (
+        "import warnings\n"
+        "import pandas as pd\n"
+        "from fastquant import backtest_many, DATA_FILE\n"
+        "param_grid = {'fast_period': [5, 10], 'slow_period': [15, 30]}\n"
+        "with warnings.catch_warnings(record=True) as caught:\n"
+        "    warnings.simplefilter('always')\n"
+        "    results = backtest_many('smac', DATA_FILE, param_grid)\n"
+        "assert not caught, [str(w.message) for w in caught]\n"
+        "assert isinstance(results, pd.DataFrame)\n"
+        "assert len(results) == 4\n"
+        "assert round(results['final_value'].iloc[-1], 2) == 103184.34\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=120)
+
+
+def test_backtest_many_after_grid_backtest():
+    # Run in a fresh interpreter, which used to hang on exit once the processes were forked after numba started its threads
+    script = (
+        "from fastquant import backtest_many, grid_backtest, DATA_FILE\n"
+        "param_grid = {'fast_period': [5, 10], 'slow_period': [15, 30]}\n"
+        "grid_backtest('smac', DATA_FILE, param_grid)\n"
+        "backtest_many('smac', DATA_FILE, param_grid)\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=120)
+
+
+def test_engine_parity():
+    # Both engines size the orders with the strategy's sell_prop and the broker's commission
+    param_grid = {"sell_prop": [0.5, 1], "buy_prop": [0.5, 1]}
+    for strategy in ["base", "rsi", "smac"]:
+        for commission in [0.002, 0.0075]:
+            expected = backtest_many(
+                strategy, DATA_FILE, param_grid, commission=commission, maxcpus=1
+            )
+            results = grid_backtest(
+                strategy, DATA_FILE, param_grid, commission=commission
+            )
+            assert (
+                (expected["final_value"] - results["final_value"]).abs() < 1e-6
+            ).all()
+
+
+def test_engine_parity_open_execution():
+    # Both engines fill the orders at the next opening price (the DCV sample has no open prices)
+    param_grid = {"sell_prop": [0.5, 1], "buy_prop": [0.5, 1]}
+    # Final values with the default sell_prop and buy_prop (last combination)
+    default_values = {"base": 174.92, "rsi": 228198.77, "smac": 194914.59}
+    for strategy, default_value in default_values.items():
+        expected = backtest_many(
+            strategy,
+            OHLCV_DATA_FILE,
+            param_grid,
+            data_format="ohlcv",
+            maxcpus=1,
+            execution_type="open",
+        )
+        results = grid_backtest(
+            strategy,
+            OHLCV_DATA_FILE,
+            dict(param_grid, execution_type=["open"]),
+            data_format="ohlcv",
+        )
+        assert ((expected["final_value"] - results["final_value"]).abs() < 1e-6).all()
+        assert round(expected["final_value"].iloc[-1], 2) == default_value